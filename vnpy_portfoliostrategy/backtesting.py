@@ -1,13 +1,11 @@
 from collections import defaultdict
 from datetime import date, datetime, timedelta
-from typing import Dict, List, Set, Tuple, Optional
+from typing import Callable, Dict, List, Set, Tuple, Optional
 from functools import lru_cache, partial
 from copy import copy
 import traceback
 
 import numpy as np
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 from pandas import DataFrame
 
 from vnpy.trader.constant import Direction, Offset, Interval, Status
@@ -465,6 +463,10 @@ class BacktestingEngine:
         if df is None:
             return
 
+        # Plotly is slow to import and only needed for charting
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
+
         fig = make_subplots(
             rows=4,
             cols=1,
@@ -692,6 +694,26 @@ class BacktestingEngine:
 
         return [order.vt_orderid]
 
+    def send_orders(
+        self,
+        strategy: StrategyTemplate,
+        reqs: List[Tuple[str, Direction, Offset, float, float]],
+        lock: bool,
+        net: bool,
+    ) -> List[str]:
+        """Send a batch of orders"""
+        send_order: Callable = self.send_order
+        vt_orderids: List[str] = []
+
+        for vt_symbol, direction, offset, price, volume in reqs:
+            vt_orderids.extend(
+                send_order(
+                    strategy, vt_symbol, direction, offset, price, volume, lock, net
+                )
+            )
+
+        return vt_orderids
+
     def cancel_order(self, strategy: StrategyTemplate, vt_orderid: str) -> None:
         """Order cancellation"""
         if vt_orderid not in self.active_limit_orders:
@@ -772,7 +794,7 @@ class ContractDailyResult:
         self.net_pnl: float = 0
 
     def add_trade(self, trade: TradeData) -> None:
-        """Add trade information""""
+        """Add trade information"""
         self.trades.append(trade)
 
     def calculate_pnl(
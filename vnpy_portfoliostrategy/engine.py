@@ -1,12 +1,16 @@
 import importlib
-import glob
+import os
 import traceback
-from collections import defaultdict
+from collections import deque
+from functools import lru_cache
 from pathlib import Path
 from types import ModuleType
-from typing import Dict, List, Set, Tuple, Type, Any, Callable, Optional
+from typing import Deque, Dict, List, Set, Type, Any, Callable, Optional, Tuple
 from datetime import datetime, timedelta
 from concurrent.futures import ThreadPoolExecutor
+from threading import Lock, get_ident
+
+import numpy as np
 
 from vnpy.event import Event, EventEngine
 from vnpy.trader.engine import BaseEngine, MainEngine
@@ -22,9 +26,14 @@ from vnpy.trader.object import (
     BarData,
     ContractData,
 )
-from vnpy.trader.event import EVENT_TICK, EVENT_ORDER, EVENT_TRADE
+from vnpy.trader.event import EVENT_TICK, EVENT_ORDER, EVENT_TRADE, EVENT_CONTRACT
 from vnpy.trader.constant import Direction, OrderType, Interval, Exchange, Offset
-from vnpy.trader.utility import load_json, save_json, extract_vt_symbol, round_to
+from vnpy.trader.utility import (
+    load_json,
+    save_json,
+    extract_vt_symbol,
+    round_to,
+)
 from vnpy.trader.datafeed import BaseDatafeed, get_datafeed
 from vnpy.trader.database import BaseDatabase, get_database, DB_TZ
 
@@ -49,12 +58,29 @@ class StrategyEngine(BaseEngine):
         self.classes: Dict[str, Type[StrategyTemplate]] = {}
         self.strategies: Dict[str, StrategyTemplate] = {}
 
-        self.symbol_strategy_map: Dict[str, List[StrategyTemplate]] = defaultdict(list)
+        self.symbol_strategy_map: Dict[str, Dict[str, StrategyTemplate]] = {}
+        self.symbol_dispatch_map: Dict[str, tuple] = {}
         self.orderid_strategy_map: Dict[str, StrategyTemplate] = {}
 
-        self.init_executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1)
+        self.contracts: Dict[str, ContractData] = {}
+
+        # File writes and logs of the thread in bulk mode are deferred and flushed
+        # once at the end, other threads (e.g. init workers) are not affected
+        self.bulk_thread: Optional[int] = None
+        self.setting_dirty: bool = False
+        self.data_dirty: bool = False
+        self.log_buffer: List[str] = []
 
+        # Strategies initialize concurrently, history queries are serialized by
+        # history_lock. Each strategy is claimed in initing so it never runs twice.
+        self.init_executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=8)
+        self.init_lock: Lock = Lock()
+        self.initing: Set[str] = set()
+        self.history_lock: Lock = Lock()
+
+        # Recently seen trade ids for dedup, bounded by a FIFO window
         self.vt_tradeids: Set[str] = set()
+        self.vt_tradeid_queue: Deque[str] = deque(maxlen=1_000_000)
 
         # Database and data services
         self.database: BaseDatabase = get_database()
@@ -73,11 +99,17 @@ class StrategyEngine(BaseEngine):
         """Close"""
         self.stop_all_strategies()
 
+        # Drop queued initializations and wait for running ones
+        with self.init_lock:
+            self.initing.clear()
+        self.init_executor.shutdown(wait=True)
+
     def register_event(self) -> None:
         """Register Event Engine"""
         self.event_engine.register(EVENT_TICK, self.process_tick_event)
         self.event_engine.register(EVENT_ORDER, self.process_order_event)
         self.event_engine.register(EVENT_TRADE, self.process_trade_event)
+        self.event_engine.register(EVENT_CONTRACT, self.process_contract_event)
 
     def init_datafeed(self) -> None:
         """Initializing Data Services"""
@@ -104,13 +136,13 @@ class StrategyEngine(BaseEngine):
         """Market Data Push"""
         tick: TickData = event.data
 
-        strategies: list = self.symbol_strategy_map[tick.vt_symbol]
-        if not strategies:
+        dispatch: Optional[tuple] = self.symbol_dispatch_map.get(tick.vt_symbol, None)
+        if not dispatch:
             return
 
-        for strategy in strategies:
+        for strategy, on_tick in dispatch:
             if strategy.inited:
-                self.call_strategy_func(strategy, strategy.on_tick, tick)
+                on_tick(tick)
 
     def process_order_event(self, event: Event) -> None:
         """Order Data Push"""
@@ -131,6 +163,11 @@ class StrategyEngine(BaseEngine):
         # Filter duplicate deal pushes
         if trade.vt_tradeid in self.vt_tradeids:
             return
+
+        if len(self.vt_tradeid_queue) == self.vt_tradeid_queue.maxlen:
+            self.vt_tradeids.discard(self.vt_tradeid_queue[0])
+
+        self.vt_tradeid_queue.append(trade.vt_tradeid)
         self.vt_tradeids.add(trade.vt_tradeid)
 
         # Push to strategy
@@ -142,6 +179,25 @@ class StrategyEngine(BaseEngine):
 
         self.call_strategy_func(strategy, strategy.update_trade, trade)
 
+    def process_contract_event(self, event: Event) -> None:
+        """Contract Data Push"""
+        contract: ContractData = event.data
+
+        # Refresh cached contracts when the gateway pushes them again (e.g. reconnect)
+        if contract.vt_symbol in self.contracts:
+            self.contracts[contract.vt_symbol] = contract
+
+    def get_contract(self, vt_symbol: str) -> Optional[ContractData]:
+        """Get contract data, cached after the first successful query"""
+        contract: Optional[ContractData] = self.contracts.get(vt_symbol, None)
+
+        if not contract:
+            contract = self.main_engine.get_contract(vt_symbol)
+            if contract:
+                self.contracts[vt_symbol] = contract
+
+        return contract
+
     def send_order(
         self,
         strategy: StrategyTemplate,
@@ -154,7 +210,7 @@ class StrategyEngine(BaseEngine):
         net: bool,
     ) -> list:
         """Send an order"""
-        contract: Optional[ContractData] = self.main_engine.get_contract(vt_symbol)
+        contract: Optional[ContractData] = self.get_contract(vt_symbol)
         if not contract:
             self.write_log(f"Order failed, contract not found: {vt_symbol}", strategy)
             return ""
@@ -195,6 +251,26 @@ class StrategyEngine(BaseEngine):
 
         return vt_orderids
 
+    def send_orders(
+        self,
+        strategy: StrategyTemplate,
+        reqs: List[Tuple[str, Direction, Offset, float, float]],
+        lock: bool,
+        net: bool,
+    ) -> List[str]:
+        """Send a batch of orders"""
+        send_order: Callable = self.send_order
+        vt_orderids: List[str] = []
+
+        for vt_symbol, direction, offset, price, volume in reqs:
+            vt_orderids.extend(
+                send_order(
+                    strategy, vt_symbol, direction, offset, price, volume, lock, net
+                )
+            )
+
+        return vt_orderids
+
     def cancel_order(self, strategy: StrategyTemplate, vt_orderid: str) -> None:
         """Order Cancellation"""
         order: Optional[OrderData] = self.main_engine.get_order(vt_orderid)
@@ -213,7 +289,7 @@ class StrategyEngine(BaseEngine):
 
     def get_pricetick(self, strategy: StrategyTemplate, vt_symbol: str) -> float:
         """Get contract price jumps"""
-        contract: Optional[ContractData] = self.main_engine.get_contract(vt_symbol)
+        contract: Optional[ContractData] = self.get_contract(vt_symbol)
 
         if contract:
             return contract.pricetick
@@ -222,7 +298,7 @@ class StrategyEngine(BaseEngine):
 
     def get_size(self, strategy: StrategyTemplate, vt_symbol: str) -> int:
         """Get contract multiplier"""
-        contract: Optional[ContractData] = self.main_engine.get_contract(vt_symbol)
+        contract: Optional[ContractData] = self.get_contract(vt_symbol)
 
         if contract:
             return contract.size
@@ -234,32 +310,62 @@ class StrategyEngine(BaseEngine):
     ) -> None:
         """Load historical data"""
         vt_symbols: list = strategy.vt_symbols
-        dts: Set[datetime] = set()
-        history_data: Dict[Tuple, BarData] = {}
+        history_data: Dict[str, List[BarData]] = {}
+        history_ts: Dict[str, np.ndarray] = {}
 
-        # Access to historical data through interfaces, data services, databases
+        # Access to historical data through interfaces, data services, databases.
+        # These backends are not known to be thread-safe, so queries from
+        # concurrent initializations are serialized and only the replay overlaps.
         for vt_symbol in vt_symbols:
-            data: List[BarData] = self.load_bar(vt_symbol, days, interval)
+            with self.history_lock:
+                data: List[BarData] = self.load_bar(vt_symbol, days, interval)
+            if not data:
+                continue
+            data.sort(key=lambda bar: bar.datetime)
+
+            history_data[vt_symbol] = data
+            history_ts[vt_symbol] = np.array(
+                [bar.datetime.timestamp() for bar in data], dtype=np.float64
+            )
+
+        if not history_data:
+            return
+
+        # Union of all bar timestamps in time order, keeping the datetime objects
+        all_ts: np.ndarray = np.concatenate(list(history_ts.values()))
+        all_dt: np.ndarray = np.array(
+            [bar.datetime for data in history_data.values() for bar in data],
+            dtype=object,
+        )
+        all_ts, first_ix = np.unique(all_ts, return_index=True)
+        dts: np.ndarray = all_dt[first_ix]
 
-            for bar in data:
-                dts.add(bar.datetime)
-                history_data[(bar.datetime, vt_symbol)] = bar
+        # Columnar layout, one column per contract: index of the latest bar at or
+        # before each timestamp (forward-fill), and whether it is an exact hit
+        columns: List[Tuple[str, List[BarData]]] = list(history_data.items())
+        ix_matrix: np.ndarray = np.empty((len(all_ts), len(columns)), dtype=np.int64)
+        hit_matrix: np.ndarray = np.empty((len(all_ts), len(columns)), dtype=bool)
 
-        dts: list = list(dts)
-        dts.sort()
+        for col, vt_symbol in enumerate(history_data):
+            ts: np.ndarray = history_ts[vt_symbol]
+            ix: np.ndarray = np.searchsorted(ts, all_ts, side="right") - 1
+            ix_matrix[:, col] = ix
+            hit_matrix[:, col] = (ix >= 0) & (ts[np.maximum(ix, 0)] == all_ts)
 
         bars: dict = {}
 
-        for dt in dts:
-            for vt_symbol in vt_symbols:
-                bar: Optional[BarData] = history_data.get((dt, vt_symbol), None)
+        for dt, ix_row, hit_row in zip(dts, ix_matrix.tolist(), hit_matrix.tolist()):
+            for (vt_symbol, data), ix, hit in zip(columns, ix_row, hit_row):
+                # No historical data yet for this contract
+                if ix < 0:
+                    continue
 
                 # If historical data is obtained for the time specified in the contract, it is cached in the bars dictionary.
-                if bar:
-                    bars[vt_symbol] = bar
-                # If you can't get it, but there is already a cache of contract data in the bars dictionary, use the previous data to fill it.
-                elif vt_symbol in bars:
-                    old_bar: BarData = bars[vt_symbol]
+                if hit:
+                    bars[vt_symbol] = data[ix]
+                # Otherwise fill it with the latest available data of the contract.
+                else:
+                    old_bar: BarData = data[ix]
 
                     bar = BarData(
                         symbol=old_bar.symbol,
@@ -277,10 +383,10 @@ class StrategyEngine(BaseEngine):
 
     def load_bar(self, vt_symbol: str, days: int, interval: Interval) -> List[BarData]:
         """Load Individual Contract Historical Data"""
-        symbol, exchange = extract_vt_symbol(vt_symbol)
+        symbol, exchange = parse_vt_symbol(vt_symbol)
         end: datetime = datetime.now(DB_TZ)
         start: datetime = end - timedelta(days)
-        contract: Optional[ContractData] = self.main_engine.get_contract(vt_symbol)
+        contract: Optional[ContractData] = self.get_contract(vt_symbol)
         data: List[BarData]
 
         # Getting historical data through the interface
@@ -320,11 +426,27 @@ class StrategyEngine(BaseEngine):
             else:
                 func()
         except Exception:
-            strategy.trading = False
-            strategy.inited = False
+            self.stop_on_exception(strategy)
+
+    def make_strategy_func(
+        self, strategy: StrategyTemplate, func: Callable
+    ) -> Callable:
+        """Wrap strategy function once, exceptions stop the strategy"""
+        def safe_func(*args) -> None:
+            try:
+                func(*args)
+            except Exception:
+                self.stop_on_exception(strategy)
+
+        return safe_func
+
+    def stop_on_exception(self, strategy: StrategyTemplate) -> None:
+        """Stop the strategy and log the exception being handled"""
+        strategy.trading = False
+        strategy.inited = False
 
-            msg: str = f"Trigger exception stopped \n{traceback.format_exc()}"
-            self.write_log(msg, strategy)
+        msg: str = f"Trigger exception stopped \n{traceback.format_exc()}"
+        self.write_log(msg, strategy)
 
     def add_strategy(
         self, class_name: str, strategy_name: str, vt_symbols: list, setting: dict
@@ -349,17 +471,27 @@ class StrategyEngine(BaseEngine):
         self.strategies[strategy_name] = strategy
 
         for vt_symbol in vt_symbols:
-            strategies: list = self.symbol_strategy_map[vt_symbol]
-            strategies.append(strategy)
+            strategies: dict = self.symbol_strategy_map.setdefault(vt_symbol, {})
+            strategies[strategy_name] = strategy
+            self.update_symbol_dispatch(vt_symbol)
 
         self.save_strategy_setting()
         self.put_strategy_event(strategy)
 
-    def init_strategy(self, strategy_name: str) -> None:
-        """Initialization strategy"""
-        self.init_executor.submit(self._init_strategy, strategy_name)
+    def update_symbol_dispatch(self, vt_symbol: str) -> None:
+        """Rebuild the tick dispatch snapshot of the contract"""
+        strategies: Optional[dict] = self.symbol_strategy_map.get(vt_symbol, None)
 
-    def _init_strategy(self, strategy_name: str) -> None:
+        if strategies:
+            self.symbol_dispatch_map[vt_symbol] = tuple(
+                (strategy, self.make_strategy_func(strategy, strategy.on_tick))
+                for strategy in strategies.values()
+            )
+        else:
+            self.symbol_strategy_map.pop(vt_symbol, None)
+            self.symbol_dispatch_map.pop(vt_symbol, None)
+
+    def init_strategy(self, strategy_name: str) -> None:
         """Initialization strategy"""
         strategy: StrategyTemplate = self.strategies[strategy_name]
 
@@ -369,6 +501,31 @@ class StrategyEngine(BaseEngine):
             )
             return
 
+        with self.init_lock:
+            if strategy_name in self.initing:
+                self.write_log(f"{strategy_name} is already being initialized")
+                return
+            self.initing.add(strategy_name)
+
+        self.init_executor.submit(self._init_strategy, strategy_name)
+
+    def _init_strategy(self, strategy_name: str) -> None:
+        """Initialization strategy"""
+        # Skip strategies released by close while queued
+        with self.init_lock:
+            if strategy_name not in self.initing:
+                return
+
+        try:
+            self.run_init_strategy(strategy_name)
+        finally:
+            with self.init_lock:
+                self.initing.discard(strategy_name)
+
+    def run_init_strategy(self, strategy_name: str) -> None:
+        """Run initialization of a claimed strategy"""
+        strategy: StrategyTemplate = self.strategies[strategy_name]
+
         self.write_log(f"{strategy_name} start performing initialization")
 
         # Calling the strategy on_init function
@@ -392,7 +549,7 @@ class StrategyEngine(BaseEngine):
 
         # Subscribe to Quotes
         for vt_symbol in strategy.vt_symbols:
-            contract: Optional[ContractData] = self.main_engine.get_contract(vt_symbol)
+            contract: Optional[ContractData] = self.get_contract(vt_symbol)
             if contract:
                 req: SubscribeRequest = SubscribeRequest(
                     symbol=contract.symbol, exchange=contract.exchange
@@ -470,8 +627,9 @@ class StrategyEngine(BaseEngine):
             return
 
         for vt_symbol in strategy.vt_symbols:
-            strategies: list = self.symbol_strategy_map[vt_symbol]
-            strategies.remove(strategy)
+            strategies: dict = self.symbol_strategy_map.get(vt_symbol, {})
+            strategies.pop(strategy_name, None)
+            self.update_symbol_dispatch(vt_symbol)
 
         for vt_orderid in strategy.active_orderids:
             if vt_orderid in self.orderid_strategy_map:
@@ -494,12 +652,24 @@ class StrategyEngine(BaseEngine):
         self, path: Path, module_name: str = ""
     ) -> None:
         """Loading Strategy Classes from a Specified Folder"""
-        for suffix in ["py", "pyd", "so"]:
-            pathname: str = str(path.joinpath(f"*.{suffix}"))
-            for filepath in glob.glob(pathname):
-                stem: str = Path(filepath).stem
-                strategy_module_name: str = f"{module_name}.{stem}"
-                self.load_strategy_class_from_module(strategy_module_name)
+        if not path.is_dir():
+            return
+
+        # Scan the folder once, a module shipped both as source and binary is imported once
+        with os.scandir(path) as entries:
+            filenames: List[str] = sorted(entry.name for entry in entries if entry.is_file())
+
+        suffixes: Set[str] = {"py", "pyd", "so"}
+        stems: List[str] = []
+
+        for filename in filenames:
+            stem, _, suffix = filename.rpartition(".")
+            if stem and suffix in suffixes:
+                stems.append(stem)
+
+        for stem in dict.fromkeys(stems):
+            strategy_module_name: str = f"{module_name}.{stem}"
+            self.load_strategy_class_from_module(strategy_module_name)
 
     def load_strategy_class_from_module(self, module_name: str) -> None:
         """Loading Strategy Classes via Strategy Files"""
@@ -529,7 +699,16 @@ class StrategyEngine(BaseEngine):
         data.pop("trading")
 
         self.strategy_data[strategy.strategy_name] = data
+        self.save_strategy_data()
+
+    def save_strategy_data(self) -> None:
+        """Save strategy data to the file"""
+        if self.in_bulk():
+            self.data_dirty = True
+            return
+
         save_json(self.data_filename, self.strategy_data)
+        self.data_dirty = False
 
     def get_all_strategy_class_names(self) -> list:
         """Get all load strategy class names"""
@@ -539,11 +718,7 @@ class StrategyEngine(BaseEngine):
         """Getting Strategy Class Parameters"""
         strategy_class: StrategyTemplate = self.classes[class_name]
 
-        parameters: dict = {}
-        for name in strategy_class.parameters:
-            parameters[name] = getattr(strategy_class, name)
-
-        return parameters
+        return strategy_class.get_class_parameters()
 
     def get_strategy_parameters(self, strategy_name) -> dict:
         """Getting Strategy Parameters"""
@@ -562,23 +737,35 @@ class StrategyEngine(BaseEngine):
 
     def stop_all_strategies(self) -> None:
         """Stop all strategies"""
-        for strategy_name in self.strategies.keys():
-            self.stop_strategy(strategy_name)
+        self.begin_bulk()
+        try:
+            for strategy_name in self.strategies.keys():
+                self.stop_strategy(strategy_name)
+        finally:
+            self.finish_bulk()
 
     def load_strategy_setting(self) -> None:
         """Load Strategy Configuration"""
         strategy_setting: dict = load_json(self.setting_filename)
 
-        for strategy_name, strategy_config in strategy_setting.items():
-            self.add_strategy(
-                strategy_config["class_name"],
-                strategy_name,
-                strategy_config["vt_symbols"],
-                strategy_config["setting"],
-            )
+        self.begin_bulk()
+        try:
+            for strategy_name, strategy_config in strategy_setting.items():
+                self.add_strategy(
+                    strategy_config["class_name"],
+                    strategy_name,
+                    strategy_config["vt_symbols"],
+                    strategy_config["setting"],
+                )
+        finally:
+            self.finish_bulk()
 
     def save_strategy_setting(self) -> None:
         """Save Strategy Configuration"""
+        if self.in_bulk():
+            self.setting_dirty = True
+            return
+
         strategy_setting: dict = {}
 
         for name, strategy in self.strategies.items():
@@ -589,6 +776,30 @@ class StrategyEngine(BaseEngine):
             }
 
         save_json(self.setting_filename, strategy_setting)
+        self.setting_dirty = False
+
+    def begin_bulk(self) -> None:
+        """Enter bulk mode for the calling thread"""
+        self.bulk_thread = get_ident()
+
+    def in_bulk(self) -> bool:
+        """Whether the calling thread is in bulk mode"""
+        return self.bulk_thread == get_ident()
+
+    def finish_bulk(self) -> None:
+        """Leave bulk mode and flush the deferred file writes"""
+        self.bulk_thread = None
+
+        if self.setting_dirty:
+            self.save_strategy_setting()
+
+        if self.data_dirty:
+            self.save_strategy_data()
+
+        # Push the buffered log lines as one event
+        log_buffer, self.log_buffer = self.log_buffer, []
+        if log_buffer:
+            self.write_log("\n".join(log_buffer))
 
     def put_strategy_event(self, strategy: StrategyTemplate) -> None:
         """Push Event Update Strategy Interface"""
@@ -601,6 +812,10 @@ class StrategyEngine(BaseEngine):
         if strategy:
             msg: str = f"{strategy.strategy_name}: {msg}"
 
+        if self.in_bulk():
+            self.log_buffer.append(msg)
+            return
+
         log: LogData = LogData(msg=msg, gateway_name=APP_NAME)
         event: Event = Event(type=EVENT_PORTFOLIO_LOG, data=log)
         self.event_engine.put(event)
@@ -613,3 +828,9 @@ class StrategyEngine(BaseEngine):
             subject: str = "Portfolio Strategy Engine"
 
         self.main_engine.send_email(subject, msg)
+
+
+@lru_cache(maxsize=4096)
+def parse_vt_symbol(vt_symbol: str) -> Tuple[str, Exchange]:
+    """Cached version of extract_vt_symbol"""
+    return extract_vt_symbol(vt_symbol)
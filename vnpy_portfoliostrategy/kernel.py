@@ -0,0 +1,83 @@
+import math
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """Fallback to plain Python when numba is not installed, much slower"""
+        def decorator(func):
+            return func
+        return decorator
+
+
+@njit(cache=True)
+def update_boll(
+    buf: np.ndarray,
+    idx: int,
+    mean: float,
+    m2: float,
+    new_val: float,
+    dev: float,
+) -> tuple:
+    """
+    Replace buf[idx] with new_val and update Bollinger Bands in O(1).
+
+    Rolling form of Welford's algorithm, returns (mean, m2, up, down).
+    """
+    n: int = buf.shape[0]
+
+    old_val: float = buf[idx]
+    buf[idx] = new_val
+
+    delta: float = new_val - old_val
+    new_mean: float = mean + delta / n
+    m2 = max(m2 + delta * (new_val - new_mean + old_val - mean), 0.0)
+
+    std: float = math.sqrt(m2 / n)
+
+    return new_mean, m2, new_mean + dev * std, new_mean - dev * std
+
+
+@njit(cache=True, fastmath=True)
+def ring_cci(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    rows: np.ndarray,
+    heads: np.ndarray,
+    window: int,
+) -> np.ndarray:
+    """
+    Calculate latest CCI of the given rows of (contracts, size) ring buffers.
+
+    heads holds the next slot to be written of each row.
+    """
+    size: int = close.shape[1]
+    cci: np.ndarray = np.empty(rows.shape[0])
+
+    for i in range(rows.shape[0]):
+        r: int = rows[i]
+        start: int = heads[r] + size - window
+
+        s: float = 0.0
+        for j in range(window):
+            k: int = (start + j) % size
+            s += (high[r, k] + low[r, k] + close[r, k]) / 3
+        mean: float = s / window
+
+        dev: float = 0.0
+        for j in range(window):
+            k: int = (start + j) % size
+            dev += abs((high[r, k] + low[r, k] + close[r, k]) / 3 - mean)
+        dev /= window
+
+        if dev > 0:
+            k: int = (start + window - 1) % size
+            tp: float = (high[r, k] + low[r, k] + close[r, k]) / 3
+            cci[i] = (tp - mean) / (0.015 * dev)
+        else:
+            cci[i] = 0.0
+
+    return cci
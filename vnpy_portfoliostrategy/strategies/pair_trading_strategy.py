@@ -1,5 +1,4 @@
 from typing import List, Dict
-from datetime import datetime
 
 import numpy as np
 
@@ -8,6 +7,7 @@ from vnpy.trader.object import TickData, BarData
 from vnpy.trader.constant import Direction
 
 from vnpy_portfoliostrategy import StrategyTemplate, StrategyEngine
+from vnpy_portfoliostrategy.kernel import update_boll
 
 
 class PairTradingStrategy(StrategyTemplate):
@@ -57,10 +57,13 @@ class PairTradingStrategy(StrategyTemplate):
         super().__init__(strategy_engine, strategy_name, vt_symbols, setting)
 
         self.bgs: Dict[str, BarGenerator] = {}
-        self.last_tick_time: datetime = None
+        self.priceticks: Dict[str, float] = {}
+        self.long_offsets: Dict[str, float] = {}
+        self.short_offsets: Dict[str, float] = {}
+        self.last_minute: int = -1
 
-        self.spread_count: int = 0
-        self.spread_data: np.array = np.zeros(100)
+        # Ring buffer of the latest boll_window spreads with running mean/M2
+        self.reset_spread_data()
 
         # Obtain contract info
         self.leg1_symbol, self.leg2_symbol = vt_symbols
@@ -76,8 +79,53 @@ class PairTradingStrategy(StrategyTemplate):
         """Strategy initialization callback"""
         self.write_log("Strategy initialized")
 
+        # Trigger JIT compilation before replaying history
+        update_boll(np.zeros(2), 0, 0.0, 0.0, 0.0, 0.0)
+
+        # Query contract priceticks once, history replay already calculates order prices
+        self.priceticks = {
+            vt_symbol: self.get_pricetick(vt_symbol) for vt_symbol in self.vt_symbols
+        }
+        self.update_price_offsets()
+
         self.load_bars(1)
 
+    def update_setting(self, setting: dict) -> None:
+        """Setting the strategy parameters"""
+        super().update_setting(setting)
+
+        # Float copies of the parameters used on every bar
+        self.ratio1: float = float(self.leg1_ratio)
+        self.ratio2: float = float(self.leg2_ratio)
+        self.dev: float = float(self.boll_dev)
+
+        # Spread buffer is sized by boll_window, rebuild it if the window changed
+        spread_data: np.ndarray = getattr(self, "spread_data", None)
+        if spread_data is not None and spread_data.shape[0] != self.boll_window:
+            self.reset_spread_data()
+
+        # Price offsets depend on tick_add, rebuild them if already initialized
+        if self.inited:
+            self.update_price_offsets()
+
+    def reset_spread_data(self) -> None:
+        """Allocate an empty contiguous spread buffer of boll_window length"""
+        self.spread_count: int = 0
+        self.spread_data: np.ndarray = np.zeros(self.boll_window, dtype=np.float64)
+        self.head: int = 0
+        self._mean: float = 0.0
+        self._m2: float = 0.0
+
+    def update_price_offsets(self) -> None:
+        """Precompute the signed order price offset of each contract"""
+        self.long_offsets = {
+            vt_symbol: self.tick_add * pricetick
+            for vt_symbol, pricetick in self.priceticks.items()
+        }
+        self.short_offsets = {
+            vt_symbol: -offset for vt_symbol, offset in self.long_offsets.items()
+        }
+
     def on_start(self) -> None:
         """Strategy startup callback"""
         self.write_log("Strategy activated")
@@ -88,7 +136,8 @@ class PairTradingStrategy(StrategyTemplate):
 
     def on_tick(self, tick: TickData) -> None:
         """Strategy tick callback"""
-        if self.last_tick_time and self.last_tick_time.minute != tick.datetime.minute:
+        minute: int = tick.datetime.minute
+        if minute != self.last_minute and self.last_minute != -1:
             bars = {}
             for vt_symbol, bg in self.bgs.items():
                 bars[vt_symbol] = bg.generate()
@@ -97,15 +146,18 @@ class PairTradingStrategy(StrategyTemplate):
         bg: BarGenerator = self.bgs[tick.vt_symbol]
         bg.update_tick(tick)
 
-        self.last_tick_time = tick.datetime
+        self.last_minute = minute
 
     def on_bars(self, bars: Dict[str, BarData]) -> None:
         """Bar callback"""
-        # Get Option Leg Bar
-        leg1_bar = bars.get(self.leg1_symbol, None)
-        leg2_bar = bars.get(self.leg2_symbol, None)
+        # Get Option Leg Bar, both option leg quotes must be present
+        try:
+            leg1_bar: BarData = bars[self.leg1_symbol]
+            leg2_bar: BarData = bars[self.leg2_symbol]
+        except KeyError:
+            return
 
-        # Both option leg quotes must be present
+        # Bars generated from ticks can be None
         if not leg1_bar or not leg2_bar:
             return
 
@@ -114,61 +166,64 @@ class PairTradingStrategy(StrategyTemplate):
             return
 
         # Calculate the current spread
-        self.current_spread = (
-            leg1_bar.close_price * self.leg1_ratio
-            - leg2_bar.close_price * self.leg2_ratio
+        current_spread: float = (
+            leg1_bar.close_price * self.ratio1 - leg2_bar.close_price * self.ratio2
         )
-
-        # Update to Spread Sequence
-        self.spread_data[:-1] = self.spread_data[1:]
-        self.spread_data[-1] = self.current_spread
+        self.current_spread = current_spread
+
+        # Update to Spread Sequence and Bollinger Bands
+        self._mean, self._m2, boll_up, boll_down = update_boll(
+            self.spread_data,
+            self.head,
+            self._mean,
+            self._m2,
+            current_spread,
+            self.dev,
+        )
+        self.head = (self.head + 1) % self.boll_window
 
         self.spread_count += 1
         if self.spread_count <= self.boll_window:
             return
 
-        # Calculating Bollinger Bands
-        buf: np.array = self.spread_data[-self.boll_window :]
-
-        std = buf.std()
-        self.boll_mid = buf.mean()
-        self.boll_up = self.boll_mid + self.boll_dev * std
-        self.boll_down = self.boll_mid - self.boll_dev * std
+        self.boll_mid = self._mean
+        self.boll_up = boll_up
+        self.boll_down = boll_down
 
         # Calculate target position
-        leg1_pos = self.get_pos(self.leg1_symbol)
+        leg1_symbol: str = self.leg1_symbol
+        leg2_symbol: str = self.leg2_symbol
+        fixed_size: int = self.fixed_size
+        leg1_pos: int = self.get_pos(leg1_symbol)
 
         if not leg1_pos:
-            if self.current_spread >= self.boll_up:
-                self.set_target(self.leg1_symbol, -self.fixed_size)
-                self.set_target(self.leg2_symbol, self.fixed_size)
-            elif self.current_spread <= self.boll_down:
-                self.set_target(self.leg1_symbol, self.fixed_size)
-                self.set_target(self.leg2_symbol, -self.fixed_size)
+            if current_spread >= boll_up:
+                self.set_target(leg1_symbol, -fixed_size)
+                self.set_target(leg2_symbol, fixed_size)
+            elif current_spread <= boll_down:
+                self.set_target(leg1_symbol, fixed_size)
+                self.set_target(leg2_symbol, -fixed_size)
         elif leg1_pos > 0:
-            if self.current_spread >= self.boll_mid:
-                self.set_target(self.leg1_symbol, 0)
-                self.set_target(self.leg2_symbol, 0)
+            if current_spread >= self._mean:
+                self.set_target(leg1_symbol, 0)
+                self.set_target(leg2_symbol, 0)
         else:
-            if self.current_spread <= self.boll_mid:
-                self.set_target(self.leg1_symbol, 0)
-                self.set_target(self.leg2_symbol, 0)
+            if current_spread <= self._mean:
+                self.set_target(leg1_symbol, 0)
+                self.set_target(leg2_symbol, 0)
 
         # Execution of position transfer transactions
         self.rebalance_portfolio(bars)
 
-        # Push update events
+        # Push update events for the updated variables
+        self.dirty = True
         self.put_event()
 
     def calculate_price(
         self, vt_symbol: str, direction: Direction, reference: float
     ) -> float:
         """Calculation of transfer order price (supports on-demand reloading implementation)"""
-        pricetick: float = self.get_pricetick(vt_symbol)
-
         if direction == Direction.LONG:
-            price: float = reference + self.tick_add * pricetick
+            return reference + self.long_offsets[vt_symbol]
         else:
-            price: float = reference - self.tick_add * pricetick
-
-        return price
+            return reference + self.short_offsets[vt_symbol]
@@ -1,5 +1,4 @@
 from typing import List, Dict
-from datetime import datetime
 
 from vnpy.trader.utility import BarGenerator, extract_vt_symbol
 from vnpy.trader.object import TickData, BarData
@@ -53,7 +52,7 @@ class PcpArbitrageStrategy(StrategyTemplate):
         super().__init__(strategy_engine, strategy_name, vt_symbols, setting)
 
         self.bgs: Dict[str, BarGenerator] = {}
-        self.last_tick_time: datetime = None
+        self.last_minute: int = -1
 
         # 绑定合约代码
         for vt_symbol in self.vt_symbols:
@@ -75,7 +74,7 @@ class PcpArbitrageStrategy(StrategyTemplate):
             self.bgs[vt_symbol] = BarGenerator(on_bar)
 
     def on_init(self) -> None:
-        """Strategy initialization callback""""
+        """Strategy initialization callback"""
         self.write_log("Strategy initialized")
 
         self.load_bars(1)
@@ -90,7 +89,8 @@ class PcpArbitrageStrategy(StrategyTemplate):
 
     def on_tick(self, tick: TickData):
         """Strategy tick callback"""
-        if self.last_tick_time and self.last_tick_time.minute != tick.datetime.minute:
+        minute: int = tick.datetime.minute
+        if minute != self.last_minute and self.last_minute != -1:
             bars = {}
             for vt_symbol, bg in self.bgs.items():
                 bars[vt_symbol] = bg.generate()
@@ -99,7 +99,7 @@ class PcpArbitrageStrategy(StrategyTemplate):
         bg: BarGenerator = self.bgs[tick.vt_symbol]
         bg.update_tick(tick)
 
-        self.last_tick_time = tick.datetime
+        self.last_minute = minute
 
     def on_bars(self, bars: Dict[str, BarData]) -> None:
         """Bar callback"""
@@ -151,6 +151,8 @@ class PcpArbitrageStrategy(StrategyTemplate):
         self.put_target = self.get_target(self.put_symbol)
         self.futures_target = self.get_target(self.futures_symbol)
 
+        # Displayed variables were updated
+        self.dirty = True
         self.put_event()
 
     def calculate_price(
@@ -1,11 +1,14 @@
-from typing import List, Dict
-from datetime import datetime
+from typing import List, Dict, Tuple
 
-from vnpy.trader.utility import ArrayManager, Interval
+import numpy as np
+
+from vnpy.trader.utility import Interval
 from vnpy.trader.object import TickData, BarData
+from vnpy.trader.constant import Direction, Offset
 
 from vnpy_portfoliostrategy import StrategyTemplate, StrategyEngine
-from vnpy_portfoliostrategy.utility import PortfolioBarGenerator
+from vnpy_portfoliostrategy.utility import PortfolioBarGenerator, PortfolioArrayManager
+from vnpy_portfoliostrategy.kernel import ring_cci
 
 
 class PortfolioBollChannelStrategy(StrategyTemplate):
@@ -42,26 +45,53 @@ class PortfolioBollChannelStrategy(StrategyTemplate):
         """Constructor"""
         super().__init__(strategy_engine, strategy_name, vt_symbols, setting)
 
-        self.boll_up: Dict[str, float] = {}
-        self.boll_down: Dict[str, float] = {}
-        self.cci_value: Dict[str, float] = {}
-        self.atr_value: Dict[str, float] = {}
-        self.intra_trade_high: Dict[str, float] = {}
-        self.intra_trade_low: Dict[str, float] = {}
-
         self.targets: Dict[str, int] = {}
-        self.last_tick_time: datetime = None
 
-        # Getting Contract Information
-        self.ams: Dict[str, ArrayManager] = {}
         for vt_symbol in self.vt_symbols:
-            self.ams[vt_symbol] = ArrayManager()
             self.targets[vt_symbol] = 0
 
+        self.reset_array_data()
+
+        # Latest indicator and trailing price values, indexed by row
+        self.boll_up: np.ndarray = np.zeros(len(self.vt_symbols))
+        self.boll_down: np.ndarray = np.zeros(len(self.vt_symbols))
+        self.cci_value: np.ndarray = np.zeros(len(self.vt_symbols))
+        self.atr_value: np.ndarray = np.zeros(len(self.vt_symbols))
+        self.intra_trade_high: np.ndarray = np.zeros(len(self.vt_symbols))
+        self.intra_trade_low: np.ndarray = np.zeros(len(self.vt_symbols))
+
         self.pbg = PortfolioBarGenerator(
             self.on_bars, 2, self.on_2hour_bars, Interval.HOUR
         )
 
+    def update_setting(self, setting: dict) -> None:
+        """Setting the strategy parameters"""
+        super().update_setting(setting)
+
+        # Buffer and running sums are built for the window lengths, rebuild them
+        # if a window changed
+        windows: Tuple[int, int, int] = getattr(self, "windows", None)
+        if windows and windows != (self.boll_window, self.cci_window, self.atr_window):
+            self.reset_array_data()
+
+    def reset_array_data(self) -> None:
+        """Allocate an empty bar buffer and running sums for the current windows"""
+        # Bar series of all contracts in one ring buffer, with running sums of the
+        # close price (sum, sum of squares) and true range over their windows.
+        # The sums are only valid for the window lengths they were built with.
+        self.windows: Tuple[int, int, int] = (
+            self.boll_window,
+            self.cci_window,
+            self.atr_window,
+        )
+        size: int = max(self.boll_window, self.cci_window, self.atr_window + 1) + 1
+
+        self.am: PortfolioArrayManager = PortfolioArrayManager(self.vt_symbols, size)
+        self.rows: Dict[str, int] = self.am.rows
+
+        self.close_sums: np.ndarray = np.zeros((len(self.vt_symbols), 2))
+        self.tr_sums: np.ndarray = np.zeros(len(self.vt_symbols))
+
     def on_init(self) -> None:
         """Strategy initialization callback"""
         self.write_log("Strategy initialized")
@@ -88,87 +118,161 @@ class PortfolioBollChannelStrategy(StrategyTemplate):
         """2-hour bar retracement"""
         self.cancel_all()
 
-        # Updating to a cached sequence
-        for vt_symbol, bar in bars.items():
-            am: ArrayManager = self.ams[vt_symbol]
-            am.update_bar(bar)
+        am: PortfolioArrayManager = self.am
+        updated: np.ndarray = am.update_bars(bars)
+
+        # Update running sums of contracts with a new bar, values leaving the
+        # windows are still in the buffer
+        boll_window, cci_window, atr_window = self.windows
+
+        new_close: np.ndarray = am.get_column(am.CLOSE, 0, updated)
+        old_close: np.ndarray = am.get_column(am.CLOSE, boll_window, updated)
+
+        self.close_sums[updated, 0] += new_close - old_close
+        self.close_sums[updated, 1] += new_close * new_close - old_close * old_close
+
+        new_tr: np.ndarray = self.get_true_range(0, updated)
+        old_tr: np.ndarray = self.get_true_range(atr_window, updated)
+        self.tr_sums[updated] += new_tr - old_tr
+
+        # Only contracts with a new bar and a filled buffer are recalculated and
+        # traded, the first true range has no previous close and must leave the window
+        ready_bars: Dict[str, BarData] = {
+            vt_symbol: bar for vt_symbol, bar in bars.items() if am.inited(vt_symbol)
+        }
+        if not ready_bars:
+            return
+
+        rows: Dict[str, int] = self.rows
+        ready_rows: List[int] = [rows[vt_symbol] for vt_symbol in ready_bars]
+        self.calculate_indicators(np.array(ready_rows, dtype=np.int64))
+
+        pos_data: Dict[str, int] = self.pos_data
+        targets: Dict[str, int] = self.targets
+
+        # Trailing high/low and stop checks run on all ready contracts at once
+        ready: np.ndarray = np.zeros(len(rows), dtype=bool)
+        ready[ready_rows] = True
+
+        positions: np.ndarray = np.zeros(len(rows))
+        positions[ready_rows] = [pos_data.get(vt_symbol, 0) for vt_symbol in ready_bars]
+
+        long_mask: np.ndarray = ready & (positions > 0)
+        short_mask: np.ndarray = ready & (positions < 0)
+        flat_mask: np.ndarray = ready & (positions == 0)
 
-        for vt_symbol, bar in bars.items():
-            am: ArrayManager = self.ams[vt_symbol]
-            if not am.inited:
-                return
+        high: np.ndarray = am.get_column(am.HIGH)
+        low: np.ndarray = am.get_column(am.LOW)
+        close: np.ndarray = am.get_column(am.CLOSE)
 
-            self.boll_up[vt_symbol], self.boll_down[vt_symbol] = am.boll(
-                self.boll_window, self.boll_dev
-            )
-            self.cci_value[vt_symbol] = am.cci(self.cci_window)
-            self.atr_value[vt_symbol] = am.atr(self.atr_window)
+        intra_trade_high: np.ndarray = self.intra_trade_high
+        intra_trade_low: np.ndarray = self.intra_trade_low
 
+        np.maximum(intra_trade_high, high, out=intra_trade_high, where=long_mask)
+        np.minimum(intra_trade_low, low, out=intra_trade_low, where=short_mask)
+
+        reset_high: np.ndarray = flat_mask | short_mask
+        reset_low: np.ndarray = flat_mask | long_mask
+        intra_trade_high[reset_high] = high[reset_high]
+        intra_trade_low[reset_low] = low[reset_low]
+
+        stop_range: np.ndarray = self.atr_value * self.sl_multiplier
+        stopped: List[bool] = (
+            (long_mask & (close <= intra_trade_high - stop_range))
+            | (short_mask & (close >= intra_trade_low + stop_range))
+        ).tolist()
+
+        boll_up: List[float] = self.boll_up.tolist()
+        boll_down: List[float] = self.boll_down.tolist()
+        cci_value: List[float] = self.cci_value.tolist()
+        fixed_size: int = self.fixed_size
+        price_add: float = self.price_add
+
+        # Orders are collected and sent as one batch
+        reqs: List[Tuple[str, Direction, Offset, float, float]] = []
+
+        for vt_symbol, bar in ready_bars.items():
             # Calculate target position
-            current_pos = self.get_pos(vt_symbol)
+            row: int = rows[vt_symbol]
+            current_pos: int = pos_data.get(vt_symbol, 0)
+            close_price: float = bar.close_price
+
             if current_pos == 0:
-                self.intra_trade_high[vt_symbol] = bar.high_price
-                self.intra_trade_low[vt_symbol] = bar.low_price
-
-                if self.cci_value[vt_symbol] > 0:
-                    self.targets[vt_symbol] = self.fixed_size
-                elif self.cci_value[vt_symbol] < 0:
-                    self.targets[vt_symbol] = -self.fixed_size
-
-            elif current_pos > 0:
-                self.intra_trade_high[vt_symbol] = max(
-                    self.intra_trade_high[vt_symbol], bar.high_price
-                )
-                self.intra_trade_low[vt_symbol] = bar.low_price
-
-                long_stop = (
-                    self.intra_trade_high[vt_symbol]
-                    - self.atr_value[vt_symbol] * self.sl_multiplier
-                )
-
-                if bar.close_price <= long_stop:
-                    self.targets[vt_symbol] = 0
-
-            elif current_pos < 0:
-                self.intra_trade_low[vt_symbol] = min(
-                    self.intra_trade_low[vt_symbol], bar.low_price
-                )
-                self.intra_trade_high[vt_symbol] = bar.high_price
-
-                short_stop = (
-                    self.intra_trade_low[vt_symbol]
-                    + self.atr_value[vt_symbol] * self.sl_multiplier
-                )
-
-                if bar.close_price >= short_stop:
-                    self.targets[vt_symbol] = 0
-
-        # Order based on target positions
-        for vt_symbol in self.vt_symbols:
-            target_pos = self.targets[vt_symbol]
-            current_pos = self.get_pos(vt_symbol)
+                if cci_value[row] > 0:
+                    targets[vt_symbol] = fixed_size
+                elif cci_value[row] < 0:
+                    targets[vt_symbol] = -fixed_size
+            elif stopped[row]:
+                targets[vt_symbol] = 0
 
-            pos_diff = target_pos - current_pos
-            volume = abs(pos_diff)
-            bar = bars[vt_symbol]
-            boll_up = self.boll_up[vt_symbol]
-            boll_down = self.boll_down[vt_symbol]
+            # Order based on target position
+            pos_diff: int = targets[vt_symbol] - current_pos
+            volume: int = abs(pos_diff)
 
             if pos_diff > 0:
-                price = bar.close_price + self.price_add
+                direction: Direction = Direction.LONG
 
                 if current_pos < 0:
-                    self.cover(vt_symbol, price, volume)
+                    offset: Offset = Offset.CLOSE
+                    price: float = close_price + price_add
                 else:
-                    self.buy(vt_symbol, boll_up, volume)
+                    offset: Offset = Offset.OPEN
+                    price: float = boll_up[row]
 
             elif pos_diff < 0:
-                price = bar.close_price - self.price_add
+                direction: Direction = Direction.SHORT
 
                 if current_pos > 0:
-                    self.sell(vt_symbol, price, volume)
+                    offset: Offset = Offset.CLOSE
+                    price: float = close_price - price_add
                 else:
-                    self.short(vt_symbol, boll_down, volume)
+                    offset: Offset = Offset.OPEN
+                    price: float = boll_down[row]
+
+            else:
+                continue
+
+            reqs.append((vt_symbol, direction, offset, price, volume))
+
+        self.send_orders(reqs)
 
         # Push interface update
         self.put_event()
+
+    def calculate_indicators(self, rows: np.ndarray) -> None:
+        """Calculate Bollinger Bands, CCI and ATR of contracts in given rows"""
+        am: PortfolioArrayManager = self.am
+        boll_window, cci_window, atr_window = self.windows
+
+        # Bollinger Bands from the running close sums
+        mid: np.ndarray = self.close_sums[rows, 0] / boll_window
+        var: np.ndarray = self.close_sums[rows, 1] / boll_window - mid * mid
+        std: np.ndarray = np.sqrt(np.maximum(var, 0))
+
+        self.boll_up[rows] = mid + std * self.boll_dev
+        self.boll_down[rows] = mid - std * self.boll_dev
+
+        # CCI on the typical price, mean deviation needs the whole window
+        self.cci_value[rows] = ring_cci(
+            am.data[:, am.HIGH],
+            am.data[:, am.LOW],
+            am.data[:, am.CLOSE],
+            rows,
+            am.heads,
+            cci_window,
+        )
+
+        # ATR from the running true range sum
+        self.atr_value[rows] = self.tr_sums[rows] / atr_window
+
+    def get_true_range(self, ago: int, rows: np.ndarray) -> np.ndarray:
+        """Get true range of contracts in given rows from ago bars before the latest"""
+        am: PortfolioArrayManager = self.am
+
+        high: np.ndarray = am.get_column(am.HIGH, ago, rows)
+        low: np.ndarray = am.get_column(am.LOW, ago, rows)
+        pre_close: np.ndarray = am.get_column(am.CLOSE, ago + 1, rows)
+
+        return np.maximum.reduce(
+            [high - low, np.abs(high - pre_close), np.abs(low - pre_close)]
+        )
@@ -1,5 +1,4 @@
 from typing import List, Dict
-from datetime import datetime
 
 from vnpy.trader.utility import ArrayManager
 from vnpy.trader.object import TickData, BarData
@@ -52,8 +51,6 @@ class TrendFollowingStrategy(StrategyTemplate):
         self.intra_trade_high: Dict[str, float] = {}
         self.intra_trade_low: Dict[str, float] = {}
 
-        self.last_tick_time: datetime = None
-
         # 创建每个合约的ArrayManager
         self.ams: Dict[str, ArrayManager] = {}
         for vt_symbol in self.vt_symbols:
@@ -62,7 +59,7 @@ class TrendFollowingStrategy(StrategyTemplate):
         self.pbg = PortfolioBarGenerator(self.on_bars)
 
     def on_init(self) -> None:
-        """Strategy initialization callback""""
+        """Strategy initialization callback"""
         self.write_log("Strategy initialized")
 
         self.rsi_buy = 50 + self.rsi_entry
@@ -1,6 +1,5 @@
 from abc import ABC
-from copy import copy
-from typing import Dict, Set, List, TYPE_CHECKING, Optional
+from typing import Dict, List, Sequence, Tuple, TYPE_CHECKING, Optional
 from collections import defaultdict
 
 from vnpy.trader.constant import Interval, Direction, Offset
@@ -20,6 +19,20 @@ class StrategyTemplate(ABC):
     parameters: list = []
     variables: list = []
 
+    # Default variables shown and saved for every strategy
+    base_variables: tuple = ("inited", "trading", "pos_data", "target_data")
+
+    # Ordered names for iteration, parameter set for membership tests
+    parameter_names: tuple = ()
+    parameter_set: frozenset = frozenset()
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        """Freeze parameter names of each strategy class"""
+        super().__init_subclass__(**kwargs)
+
+        cls.parameter_names = tuple(cls.parameters)
+        cls.parameter_set = frozenset(cls.parameter_names)
+
     def __init__(
         self,
         strategy_engine: "StrategyEngine",
@@ -42,45 +55,49 @@ class StrategyTemplate(ABC):
 
         # Delegated cache container
         self.orders: Dict[str, OrderData] = {}
-        self.active_orderids: Set[str] = set()
+        self.active_orderids: Dict[str, None] = {}  # Insertion ordered set
+
+        # Event push is skipped until pushed data changes. Trades and targets mark
+        # it, strategies set dirty after assigning their own variables.
+        self.dirty: bool = True
 
-        # Copy the list of variable names and insert the default variable contents
-        self.variables: list = copy(self.variables)
-        self.variables.insert(0, "inited")
-        self.variables.insert(1, "trading")
-        self.variables.insert(2, "pos_data")
-        self.variables.insert(3, "target_data")
+        # Copy the list of variable names with the default variables in front
+        self.variables: list = [*self.base_variables, *self.variables]
 
         # Setting Strategy Parameters
         self.update_setting(setting)
 
     def update_setting(self, setting: dict) -> None:
         """Setting the strategy parameters"""
-        for name in self.parameters:
-            if name in setting:
-                setattr(self, name, setting[name])
+        parameter_set: frozenset = self.parameter_set
+
+        # setattr so property setters of parameters are applied
+        for name, value in setting.items():
+            if name in parameter_set:
+                setattr(self, name, value)
 
     @classmethod
     def get_class_parameters(cls) -> dict:
         """Look up the default parameters of the strategy"""
-        class_parameters: dict = {}
-        for name in cls.parameters:
-            class_parameters[name] = getattr(cls, name)
-        return class_parameters
+        return {name: getattr(cls, name) for name in cls.parameter_names}
 
     def get_parameters(self) -> dict:
         """Query strategy parameters"""
-        strategy_parameters: dict = {}
-        for name in self.parameters:
-            strategy_parameters[name] = getattr(self, name)
-        return strategy_parameters
+        return self.read_attributes(self.parameter_names)
 
     def get_variables(self) -> dict:
         """Query strategy variables"""
-        strategy_variables: dict = {}
-        for name in self.variables:
-            strategy_variables[name] = getattr(self, name)
-        return strategy_variables
+        return self.read_attributes(self.variables)
+
+    def read_attributes(self, names: Sequence[str]) -> dict:
+        """Read attribute values, from the instance dict first"""
+        attributes: dict = self.__dict__
+
+        # Missing names go through getattr so class defaults and descriptors resolve
+        return {
+            name: attributes[name] if name in attributes else getattr(self, name)
+            for name in names
+        }
 
     def get_data(self) -> dict:
         """Query strategy status data"""
@@ -96,7 +113,7 @@ class StrategyTemplate(ABC):
 
     @virtual
     def on_init(self) -> None:
-        """Strategy initialization callback""""
+        """Strategy initialization callback"""
         pass
 
     @virtual
@@ -121,6 +138,8 @@ class StrategyTemplate(ABC):
 
     def update_trade(self, trade: TradeData) -> None:
         """Trade data update"""
+        self.dirty = True
+
         if trade.direction == Direction.LONG:
             self.pos_data[trade.vt_symbol] += trade.volume
         else:
@@ -128,10 +147,11 @@ class StrategyTemplate(ABC):
 
     def update_order(self, order: OrderData) -> None:
         """Order data update"""
-        self.orders[order.vt_orderid] = order
+        vt_orderid: str = order.vt_orderid
+        self.orders[vt_orderid] = order
 
-        if not order.is_active() and order.vt_orderid in self.active_orderids:
-            self.active_orderids.remove(order.vt_orderid)
+        if not order.is_active():
+            self.active_orderids.pop(vt_orderid, None)
 
     def buy(
         self,
@@ -201,13 +221,27 @@ class StrategyTemplate(ABC):
                 self, vt_symbol, direction, offset, price, volume, lock, net
             )
 
-            for vt_orderid in vt_orderids:
-                self.active_orderids.add(vt_orderid)
+            self.active_orderids.update(dict.fromkeys(vt_orderids))
 
             return vt_orderids
         else:
             return []
 
+    def send_orders(
+        self,
+        reqs: List[Tuple[str, Direction, Offset, float, float]],
+        lock: bool = False,
+        net: bool = False,
+    ) -> List[str]:
+        """Send a batch of (vt_symbol, direction, offset, price, volume) orders"""
+        if not self.trading or not reqs:
+            return []
+
+        vt_orderids: list = self.strategy_engine.send_orders(self, reqs, lock, net)
+        self.active_orderids.update(dict.fromkeys(vt_orderids))
+
+        return vt_orderids
+
     def cancel_order(self, vt_orderid: str) -> None:
         """Cancel order"""
         if self.trading:
@@ -215,7 +249,11 @@ class StrategyTemplate(ABC):
 
     def cancel_all(self) -> None:
         """Cancel all orders"""
-        for vt_orderid in list(self.active_orderids):
+        if not self.active_orderids:
+            return
+
+        # Snapshot the ids, cancelling can remove them synchronously
+        for vt_orderid in tuple(self.active_orderids):
             self.cancel_order(vt_orderid)
 
     def get_pos(self, vt_symbol: str) -> int:
@@ -224,69 +262,55 @@ class StrategyTemplate(ABC):
 
     def get_target(self, vt_symbol: str) -> int:
         """Check Target Position"""
-        return self.target_data[vt_symbol]
+        return self.target_data.get(vt_symbol, 0)
 
     def set_target(self, vt_symbol: str, target: int) -> None:
         """Setting Target Positions"""
         self.target_data[vt_symbol] = target
+        self.dirty = True
 
     def rebalance_portfolio(self, bars: Dict[str, BarData]) -> None:
         """Execute a position trade based on the target"""
         self.cancel_all()
 
+        # Bind the lookups used in the loop to locals
+        target_data: Dict[str, int] = self.target_data
+        pos_data: Dict[str, int] = self.pos_data
+        calculate_price = self.calculate_price
+
+        # Orders are collected and sent as one batch
+        reqs: List[Tuple[str, Direction, Offset, float, float]] = []
+
         # Issues orders only for contracts with current bars.
         for vt_symbol, bar in bars.items():
             # Calculate position spreads
-            target: int = self.get_target(vt_symbol)
-            pos: int = self.get_pos(vt_symbol)
+            target: int = target_data.get(vt_symbol, 0)
+            pos: int = pos_data.get(vt_symbol, 0)
             diff: int = target - pos
 
-            # Long
+            # Split the spread into closing the opposite position and opening new one
             if diff > 0:
-                # Calculate the long order price
-                order_price: float = self.calculate_price(
-                    vt_symbol, Direction.LONG, bar.close_price
-                )
-
-                # Calculate the cover and buy volume
-                cover_volume: int = 0
-                buy_volume: int = 0
-
-                if pos < 0:
-                    cover_volume = min(diff, abs(pos))
-                    buy_volume = diff - cover_volume
-                else:
-                    buy_volume = diff
-
-                # Issuance of correspondent orders
-                if cover_volume:
-                    self.cover(vt_symbol, order_price, cover_volume)
-
-                if buy_volume:
-                    self.buy(vt_symbol, order_price, buy_volume)
-            # Short
+                direction: Direction = Direction.LONG
+                close_volume: int = min(diff, -pos) if pos < 0 else 0
+                open_volume: int = diff - close_volume
             elif diff < 0:
-                # Calculate Short Order Price
-                order_price: float = self.calculate_price(
-                    vt_symbol, Direction.SHORT, bar.close_price
-                )
+                direction: Direction = Direction.SHORT
+                close_volume: int = min(-diff, pos) if pos > 0 else 0
+                open_volume: int = -diff - close_volume
+            else:
+                continue
 
-                # Calculate the sell and short volume
-                sell_volume: int = 0
-                short_volume: int = 0
+            # Calculate the order price
+            price: float = calculate_price(vt_symbol, direction, bar.close_price)
 
-                if pos > 0:
-                    sell_volume = min(abs(diff), pos)
-                    short_volume = abs(diff) - sell_volume
-                else:
-                    short_volume = abs(diff)
+            # Issuance of correspondent orders
+            if close_volume:
+                reqs.append((vt_symbol, direction, Offset.CLOSE, price, close_volume))
 
-                # Issuance of correspondent orders
-                if sell_volume:
-                    self.sell(vt_symbol, order_price, sell_volume)
+            if open_volume:
+                reqs.append((vt_symbol, direction, Offset.OPEN, price, open_volume))
 
-                if short_volume:
-                    self.short(vt_symbol, order_price, short_volume)
+        self.send_orders(reqs)
 
     @virtual
     def calculate_price(
@@ -325,8 +349,11 @@ class StrategyTemplate(ABC):
 
     def put_event(self) -> None:
         """Push strategy data update events"""
-        if self.inited:
-            self.strategy_engine.put_strategy_event(self)
+        if not self.inited or not self.dirty:
+            return
+        self.dirty = False
+
+        self.strategy_engine.put_strategy_event(self)
 
     def send_email(self, msg: str) -> None:
         """Send e-mail message"""
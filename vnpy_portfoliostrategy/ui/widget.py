@@ -1,4 +1,6 @@
-from typing import Dict
+import re
+from threading import Lock
+from typing import Dict, List, Optional, Tuple, Type
 
 from vnpy.event import Event, EventEngine
 from vnpy.trader.engine import MainEngine
@@ -8,11 +10,30 @@ from ..base import APP_NAME, EVENT_PORTFOLIO_LOG, EVENT_PORTFOLIO_STRATEGY
 from ..engine import StrategyEngine
 
 
+# Milliseconds between two renders of strategy data
+FLUSH_INTERVAL: int = 50
+
+# Separator of vt_symbols in the add strategy dialog, trims whitespace around commas
+VT_SYMBOLS_SEPARATOR: re.Pattern = re.compile(r"\s*,\s*")
+
+# Rows kept in the log monitor and milliseconds between row height updates
+MAX_LOG_ROWS: int = 1000
+RESIZE_INTERVAL: int = 100
+
+# Validator class of each parameter type
+validator_types: Dict[type, Type[QtGui.QValidator]] = {
+    int: QtGui.QIntValidator,
+    float: QtGui.QDoubleValidator,
+}
+
+# Validators are stateless and shared by all setting editors
+validators: Dict[type, Optional[QtGui.QValidator]] = {}
+
+
 class PortfolioStrategyManager(QtWidgets.QWidget):
     """Portfolio Strategy Interface"""
 
-    signal_log: QtCore.Signal = QtCore.Signal(Event)
-    signal_strategy: QtCore.Signal = QtCore.Signal(Event)
+    signal_flush: QtCore.Signal = QtCore.Signal()
 
     def __init__(self, main_engine: MainEngine, event_engine: EventEngine) -> None:
         """Constructor"""
@@ -23,6 +44,20 @@ class PortfolioStrategyManager(QtWidgets.QWidget):
         self.strategy_engine: StrategyEngine = main_engine.get_engine(APP_NAME)
 
         self.managers: Dict[str, StrategyManager] = {}
+        self.class_names: Tuple[str, ...] = ()  # Names shown in class combo
+
+        # Setting editors reused across opens, keyed by (strategy_name, class_name)
+        self.editors: Dict[Tuple[str, str], SettingEditor] = {}
+
+        # Latest data of each strategy, written by the event engine thread and
+        # rendered by the GUI thread once per flush interval
+        self.pending_data: Dict[str, StrategyData] = {}
+        self.pending_lock: Lock = Lock()
+        self.flush_scheduled: bool = False
+
+        self.flush_timer: QtCore.QTimer = QtCore.QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.timeout.connect(self.flush_pending_data)
 
         self.init_ui()
         self.register_event()
@@ -51,15 +86,14 @@ class PortfolioStrategyManager(QtWidgets.QWidget):
         clear_button: QtWidgets.QPushButton = QtWidgets.QPushButton("Clear log")
         clear_button.clicked.connect(self.clear_log)
 
-        self.scroll_layout: QtWidgets.QVBoxLayout = QtWidgets.QVBoxLayout()
-        self.scroll_layout.addStretch()
-
-        scroll_widget: QtWidgets.QWidget = QtWidgets.QWidget()
-        scroll_widget.setLayout(self.scroll_layout)
+        self.scroll_area: QtWidgets.QScrollArea = QtWidgets.QScrollArea()
+        self.scroll_area.setWidgetResizable(True)
+        self.rebuild_scroll_contents()
 
-        scroll_area: QtWidgets.QScrollArea = QtWidgets.QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setWidget(scroll_widget)
+        # Strategy bodies are built once scrolled into view
+        scroll_bar: QtWidgets.QScrollBar = self.scroll_area.verticalScrollBar()
+        scroll_bar.valueChanged.connect(self.build_visible_managers)
+        scroll_bar.rangeChanged.connect(self.build_visible_managers)
 
         self.log_monitor: LogMonitor = LogMonitor(self.main_engine, self.event_engine)
 
@@ -73,7 +107,7 @@ class PortfolioStrategyManager(QtWidgets.QWidget):
         hbox1.addWidget(clear_button)
 
         hbox2: QtWidgets.QHBoxLayout = QtWidgets.QHBoxLayout()
-        hbox2.addWidget(scroll_area)
+        hbox2.addWidget(self.scroll_area)
         hbox2.addWidget(self.log_monitor)
 
         vbox: QtWidgets.QVBoxLayout = QtWidgets.QVBoxLayout()
@@ -84,32 +118,110 @@ class PortfolioStrategyManager(QtWidgets.QWidget):
 
     def update_class_combo(self) -> None:
         """Updating the strategy class name display control"""
-        self.class_combo.addItems(self.strategy_engine.get_all_strategy_class_names())
+        class_names: Tuple[str, ...] = tuple(
+            self.strategy_engine.get_all_strategy_class_names()
+        )
+        if class_names == self.class_names:
+            return
+        self.class_names = class_names
+
+        self.class_combo.clear()
+        self.class_combo.addItems(class_names)
 
     def register_event(self) -> None:
         """Registering the Event Engine"""
-        self.signal_strategy.connect(self.process_strategy_event)
+        self.signal_flush.connect(self.start_flush_timer)
 
-        self.event_engine.register(EVENT_PORTFOLIO_STRATEGY, self.signal_strategy.emit)
+        self.event_engine.register(
+            EVENT_PORTFOLIO_STRATEGY, self.process_strategy_event
+        )
 
     def process_strategy_event(self, event: Event) -> None:
-        """Strategy event push"""
-        data: dict = event.data
-        strategy_name: str = data["strategy_name"]
+        """Strategy event push, called in the event engine thread"""
+        data: StrategyData = StrategyData(event.data)
 
-        if strategy_name in self.managers:
-            manager: StrategyManager = self.managers[strategy_name]
-            manager.update_data(data)
-        else:
-            manager: StrategyManager = StrategyManager(self, self.strategy_engine, data)
-            self.scroll_layout.insertWidget(0, manager)
-            self.managers[strategy_name] = manager
+        with self.pending_lock:
+            self.pending_data[data.strategy_name] = data
+
+            scheduled: bool = self.flush_scheduled
+            self.flush_scheduled = True
+
+        # Only the first event of each interval crosses into the GUI thread
+        if not scheduled:
+            self.signal_flush.emit()
+
+    def start_flush_timer(self) -> None:
+        """Schedule rendering of pending strategy data"""
+        self.flush_timer.start(FLUSH_INTERVAL)
+
+    def flush_pending_data(self) -> None:
+        """Render the latest data of strategies updated since last flush"""
+        with self.pending_lock:
+            pending_data, self.pending_data = self.pending_data, {}
+            self.flush_scheduled = False
+
+        added: bool = False
+
+        for strategy_name, data in pending_data.items():
+            if strategy_name in self.managers:
+                manager: StrategyManager = self.managers[strategy_name]
+                manager.update_data(data)
+            else:
+                manager: StrategyManager = StrategyManager(
+                    self, self.strategy_engine, data
+                )
+                self.managers[strategy_name] = manager
+                added = True
+
+        if added:
+            self.rebuild_scroll_contents()
+
+        # Check visibility after the layout has placed new managers
+        QtCore.QTimer.singleShot(0, self.build_visible_managers)
+
+    def rebuild_scroll_contents(self) -> None:
+        """Lay out all managers in a new scroll widget, latest added on top"""
+        scroll_layout: QtWidgets.QVBoxLayout = QtWidgets.QVBoxLayout()
+
+        scroll_widget: QtWidgets.QWidget = QtWidgets.QWidget()
+        scroll_widget.setLayout(scroll_layout)
+
+        # Managers are reparented before the old widget is deleted by setWidget
+        for manager in reversed(self.managers.values()):
+            scroll_layout.addWidget(manager)
+        scroll_layout.addStretch()
+
+        self.scroll_area.setWidget(scroll_widget)
+
+    def build_visible_managers(self, *args) -> None:
+        """Build the body of managers intersecting the scroll viewport"""
+        # Place managers now, new ones still have their default geometry at y=0
+        # until the pending layout request is processed
+        scroll_widget: QtWidgets.QWidget = self.scroll_area.widget()
+        scroll_widget.layout().activate()
+
+        # Viewport area in scroll widget coordinates
+        viewport: QtWidgets.QWidget = self.scroll_area.viewport()
+        viewport_rect: QtCore.QRect = QtCore.QRect(
+            0, -scroll_widget.y(), viewport.width(), viewport.height()
+        )
+
+        for manager in self.managers.values():
+            if not manager.body_built and manager.geometry().intersects(viewport_rect):
+                manager.init_body()
 
     def remove_strategy(self, strategy_name: str) -> None:
         """Removal strategy"""
         manager: StrategyManager = self.managers.pop(strategy_name)
         manager.deleteLater()
 
+        with self.pending_lock:
+            self.pending_data.pop(strategy_name, None)
+
+        editor: Optional[SettingEditor] = self.editors.pop((strategy_name, ""), None)
+        if editor:
+            editor.deleteLater()
+
     def add_strategy(self) -> None:
         """Add strategy"""
         class_name: str = str(self.class_combo.currentText())
@@ -119,18 +231,39 @@ class PortfolioStrategyManager(QtWidgets.QWidget):
         parameters: dict = self.strategy_engine.get_strategy_class_parameters(
             class_name
         )
-        editor: SettingEditor = SettingEditor(parameters, class_name=class_name)
+        editor: SettingEditor = self.get_editor(parameters, class_name=class_name)
         n: int = editor.exec_()
 
         if n == editor.Accepted:
             setting: dict = editor.get_setting()
-            vt_symbols: str = setting.pop("vt_symbols").split(",")
+            vt_symbols: List[str] = [
+                vt_symbol
+                for vt_symbol in VT_SYMBOLS_SEPARATOR.split(
+                    setting.pop("vt_symbols").strip()
+                )
+                if vt_symbol
+            ]
             strategy_name: str = setting.pop("strategy_name")
 
             self.strategy_engine.add_strategy(
                 class_name, strategy_name, vt_symbols, setting
             )
 
+    def get_editor(
+        self, parameters: dict, strategy_name: str = "", class_name: str = ""
+    ) -> "SettingEditor":
+        """Get the cached setting editor of a strategy or class, refreshed"""
+        key: Tuple[str, str] = (strategy_name, class_name)
+
+        editor: Optional[SettingEditor] = self.editors.get(key)
+        if editor is None:
+            editor = SettingEditor(parameters, strategy_name, class_name, self)
+            self.editors[key] = editor
+        else:
+            editor.refresh(parameters)
+
+        return editor
+
     def clear_log(self) -> None:
         """Clearing logs"""
         self.log_monitor.setRowCount(0)
@@ -143,11 +276,18 @@ class PortfolioStrategyManager(QtWidgets.QWidget):
 class StrategyManager(QtWidgets.QFrame):
     """Strategy Manager"""
 
+    # Enabled status of (init, start, stop, edit, remove) buttons for each
+    # (inited << 1 | trading) state, buttons are left unchanged before inited
+    button_table: Dict[int, Tuple[bool, ...]] = {
+        0b10: (False, True, False, True, True),
+        0b11: (False, False, True, False, False),
+    }
+
     def __init__(
         self,
         strategy_manager: PortfolioStrategyManager,
         strategy_engine: StrategyEngine,
-        data: dict,
+        data: "StrategyData",
     ) -> None:
         """Constructor"""
         super().__init__()
@@ -155,17 +295,40 @@ class StrategyManager(QtWidgets.QFrame):
         self.strategy_manager: PortfolioStrategyManager = strategy_manager
         self.strategy_engine: StrategyEngine = strategy_engine
 
-        self.strategy_name: str = data["strategy_name"]
-        self._data: dict = data
+        self.strategy_name: str = data.strategy_name
+        self._data: StrategyData = data
+
+        # Signatures of the data last rendered, variables contain dicts so repr is used
+        self.parameters_signature: str = ""
+        self.variables_signature: str = ""
+
+        # Buttons and monitors are only created once visible
+        self.body_built: bool = False
+        self.button_state: int = -1
 
         self.init_ui()
 
     def init_ui(self) -> None:
-        """Initialization interface"""
+        """Initialization interface, only the header until the body is built"""
         self.setFixedHeight(300)
         self.setFrameShape(self.Box)
         self.setLineWidth(1)
 
+        strategy_name: str = self._data.strategy_name
+        class_name: str = self._data.class_name
+        author: str = self._data.author
+
+        label_text: str = f"{strategy_name}  -  ({class_name} by {author})"
+        label: QtWidgets.QLabel = QtWidgets.QLabel(label_text)
+        label.setAlignment(QtCore.Qt.AlignCenter)
+
+        self.vbox: QtWidgets.QVBoxLayout = QtWidgets.QVBoxLayout()
+        self.vbox.addWidget(label)
+        self.vbox.addStretch()
+        self.setLayout(self.vbox)
+
+    def init_body(self) -> None:
+        """Create buttons and data monitors"""
         self.init_button: QtWidgets.QPushButton = QtWidgets.QPushButton("Initialize")
         self.init_button.clicked.connect(self.init_strategy)
 
@@ -183,16 +346,10 @@ class StrategyManager(QtWidgets.QFrame):
         self.remove_button: QtWidgets.QPushButton = QtWidgets.QPushButton("Remove")
         self.remove_button.clicked.connect(self.remove_strategy)
 
-        strategy_name: str = self._data["strategy_name"]
-        class_name: str = self._data["class_name"]
-        author: str = self._data["author"]
-
-        label_text: str = f"{strategy_name}  -  ({class_name} by {author})"
-        label: QtWidgets.QLabel = QtWidgets.QLabel(label_text)
-        label.setAlignment(QtCore.Qt.AlignCenter)
-
-        self.parameters_monitor: DataMonitor = DataMonitor(self._data["parameters"])
-        self.variables_monitor: DataMonitor = DataMonitor(self._data["variables"])
+        # Parameters and variables share one monitor, variables in bold headers
+        self.data_monitor: DataMonitor = DataMonitor(
+            self._data.parameters, self._data.variables
+        )
 
         hbox: QtWidgets.QHBoxLayout = QtWidgets.QHBoxLayout()
         hbox.addWidget(self.init_button)
@@ -201,39 +358,62 @@ class StrategyManager(QtWidgets.QFrame):
         hbox.addWidget(self.edit_button)
         hbox.addWidget(self.remove_button)
 
-        vbox: QtWidgets.QVBoxLayout = QtWidgets.QVBoxLayout()
-        vbox.addWidget(label)
-        vbox.addLayout(hbox)
-        vbox.addWidget(self.parameters_monitor)
-        vbox.addWidget(self.variables_monitor)
-        self.setLayout(vbox)
+        self.buttons: Tuple[QtWidgets.QPushButton, ...] = (
+            self.init_button,
+            self.start_button,
+            self.stop_button,
+            self.edit_button,
+            self.remove_button,
+        )
+
+        # Replace the placeholder stretch below the label
+        self.vbox.takeAt(1)
+        self.vbox.addLayout(hbox)
+        self.vbox.addWidget(self.data_monitor)
+
+        self.body_built = True
 
-    def update_data(self, data: dict) -> None:
+        # Render the latest data received while hidden
+        self.update_data(self._data)
+
+    def update_data(self, data: "StrategyData") -> None:
         """Update strategy data"""
-        self._data: dict = data
+        self._data: StrategyData = data
+
+        if not self.body_built:
+            return
 
-        self.parameters_monitor.update_data(data["parameters"])
-        self.variables_monitor.update_data(data["variables"])
+        parameters_signature: str = repr(data.parameters)
+        if parameters_signature != self.parameters_signature:
+            self.parameters_signature = parameters_signature
+            self.data_monitor.update_data(data.parameters, 0)
+
+        variables_signature: str = repr(data.variables)
+        if variables_signature == self.variables_signature:
+            return
+        self.variables_signature = variables_signature
+
+        self.data_monitor.update_data(data.variables, 1)
 
         # Update button status
-        variables: dict = data["variables"]
-        inited: bool = variables["inited"]
-        trading: bool = variables["trading"]
+        state: int = (data.inited << 1) | data.trading
 
-        if not inited:
+        if state == self.button_state:
             return
-        self.init_button.setEnabled(False)
+        self.button_state = state
 
-        if trading:
-            self.start_button.setEnabled(False)
-            self.stop_button.setEnabled(True)
-            self.edit_button.setEnabled(False)
-            self.remove_button.setEnabled(False)
-        else:
-            self.start_button.setEnabled(True)
-            self.stop_button.setEnabled(False)
-            self.edit_button.setEnabled(True)
-            self.remove_button.setEnabled(True)
+        enabled: Optional[Tuple[bool, ...]] = self.button_table.get(state)
+        if not enabled:
+            return
+
+        # Repaint the frame once after all buttons changed
+        self.setUpdatesEnabled(False)
+
+        for button, button_enabled in zip(self.buttons, enabled):
+            if button.isEnabled() != button_enabled:
+                button.setEnabled(button_enabled)
+
+        self.setUpdatesEnabled(True)
 
     def init_strategy(self) -> None:
         """Initialization strategy"""
@@ -249,10 +429,12 @@ class StrategyManager(QtWidgets.QFrame):
 
     def edit_strategy(self) -> None:
         """Edit strategy"""
-        strategy_name: str = self._data["strategy_name"]
+        strategy_name: str = self._data.strategy_name
 
         parameters: dict = self.strategy_engine.get_strategy_parameters(strategy_name)
-        editor: SettingEditor = SettingEditor(parameters, strategy_name=strategy_name)
+        editor: SettingEditor = self.strategy_manager.get_editor(
+            parameters, strategy_name=strategy_name
+        )
         n: int = editor.exec_()
 
         if n == editor.Accepted:
@@ -268,43 +450,116 @@ class StrategyManager(QtWidgets.QFrame):
             self.strategy_manager.remove_strategy(self.strategy_name)
 
 
-class DataMonitor(QtWidgets.QTableWidget):
+class StrategyRowModel(QtCore.QAbstractTableModel):
+    """Read-only single row model of strategy data sections"""
+
+    # All cells share one alignment, returned for TextAlignmentRole
+    alignment: int = int(QtCore.Qt.AlignCenter)
+
+    def __init__(self, *sections: dict) -> None:
+        """Constructor"""
+        super().__init__()
+
+        self.names: List[str] = []
+        self.texts: List[str] = []
+        self.starts: List[int] = []  # First column of each section
+
+        # Headers after the first section are bold to tell the sections apart
+        self.bold_start: int = len(sections[0])
+        self.bold_font: QtGui.QFont = QtGui.QFont()
+        self.bold_font.setBold(True)
+
+        for data in sections:
+            self.starts.append(len(self.names))
+            self.names.extend(data.keys())
+            self.texts.extend(str(value) for value in data.values())
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        """Number of rows"""
+        if parent.isValid():
+            return 0
+        return 1
+
+    def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        """Number of columns"""
+        if parent.isValid():
+            return 0
+        return len(self.names)
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.DisplayRole):
+        """Cell text and alignment"""
+        if role == QtCore.Qt.DisplayRole:
+            return self.texts[index.column()]
+        elif role == QtCore.Qt.TextAlignmentRole:
+            return self.alignment
+        return None
+
+    def headerData(
+        self,
+        section: int,
+        orientation: QtCore.Qt.Orientation,
+        role: int = QtCore.Qt.DisplayRole,
+    ):
+        """Column names as horizontal header"""
+        if orientation != QtCore.Qt.Horizontal:
+            return None
+
+        if role == QtCore.Qt.DisplayRole:
+            return self.names[section]
+        elif role == QtCore.Qt.FontRole and section >= self.bold_start:
+            return self.bold_font
+        return None
+
+    def update_data(self, data: dict, section: int = 0) -> None:
+        """
+        Update texts and notify the view of the changed range once.
+
+        Strategy data keeps the key order of its declared names, so values map
+        to columns by position without looking up names.
+        """
+        texts: List[str] = self.texts
+
+        first: int = len(texts)
+        last: int = -1
+
+        for column, value in enumerate(data.values(), self.starts[section]):
+            text: str = value if type(value) is str else str(value)
+
+            if text == texts[column]:
+                continue
+            texts[column] = text
+
+            first = min(first, column)
+            last = max(last, column)
+
+        if last >= 0:
+            self.dataChanged.emit(
+                self.index(0, first), self.index(0, last), [QtCore.Qt.DisplayRole]
+            )
+
+
+class DataMonitor(QtWidgets.QTableView):
     """Strategy Monitoring Component"""
 
-    def __init__(self, data: dict) -> None:
+    def __init__(self, *sections: dict) -> None:
         """Constructor"""
         super(DataMonitor, self).__init__()
 
-        self._data: dict = data
-        self.cells: dict = {}
+        self.data_model: StrategyRowModel = StrategyRowModel(*sections)
 
         self.init_ui()
 
     def init_ui(self) -> None:
         """Initialization Interface"""
-        labels: list = list(self._data.keys())
-        self.setColumnCount(len(labels))
-        self.setHorizontalHeaderLabels(labels)
+        self.setModel(self.data_model)
 
-        self.setRowCount(1)
         self.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Stretch)
         self.verticalHeader().setVisible(False)
         self.setEditTriggers(self.NoEditTriggers)
 
-        for column, name in enumerate(self._data.keys()):
-            value = self._data[name]
-
-            cell: QtWidgets.QTableWidgetItem = QtWidgets.QTableWidgetItem(str(value))
-            cell.setTextAlignment(QtCore.Qt.AlignCenter)
-
-            self.setItem(0, column, cell)
-            self.cells[name] = cell
-
-    def update_data(self, data: dict):
+    def update_data(self, data: dict, section: int = 0):
         """Updated data"""
-        for name, value in data.items():
-            cell: QtWidgets.QTableWidgetItem = self.cells[name]
-            cell.setText(str(value))
+        self.data_model.update_data(data, section)
 
 
 class LogMonitor(BaseMonitor):
@@ -325,20 +580,45 @@ class LogMonitor(BaseMonitor):
 
         self.horizontalHeader().setSectionResizeMode(1, QtWidgets.QHeaderView.Stretch)
 
+        # New rows are inserted on top and resized together by the timer
+        self.resize_count: int = 0
+
+        self.resize_timer: QtCore.QTimer = QtCore.QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.timeout.connect(self.resize_new_rows)
+
     def insert_new_row(self, data) -> None:
         """Insert a new line"""
         super().insert_new_row(data)
-        self.resizeRowToContents(0)
+
+        if self.rowCount() > MAX_LOG_ROWS:
+            self.removeRow(self.rowCount() - 1)
+
+        self.resize_count += 1
+        if not self.resize_timer.isActive():
+            self.resize_timer.start(RESIZE_INTERVAL)
+
+    def resize_new_rows(self) -> None:
+        """Fit the height of rows inserted since last resize"""
+        count: int = min(self.resize_count, self.rowCount())
+        self.resize_count = 0
+
+        for row in range(count):
+            self.resizeRowToContents(row)
 
 
 class SettingEditor(QtWidgets.QDialog):
     """Setting Editor"""
 
     def __init__(
-        self, parameters: dict, strategy_name: str = "", class_name: str = ""
+        self,
+        parameters: dict,
+        strategy_name: str = "",
+        class_name: str = "",
+        parent: Optional[QtWidgets.QWidget] = None,
     ) -> None:
         """Constructor"""
-        super(SettingEditor, self).__init__()
+        super(SettingEditor, self).__init__(parent)
 
         self.parameters: dict = parameters
         self.strategy_name: str = strategy_name
@@ -355,22 +635,19 @@ class SettingEditor(QtWidgets.QDialog):
         if self.class_name:
             self.setWindowTitle(f"Add strategy: {self.class_name}")
             button_text: str = "Add"
-            parameters: dict = {"strategy_name": "", "vt_symbols": ""}
-            parameters.update(self.parameters)
         else:
             self.setWindowTitle(f"Parameter edit: {self.strategy_name}")
             button_text: str = "OK"
-            parameters: dict = self.parameters
+
+        parameters: dict = self.get_form_values()
 
         for name, value in parameters.items():
             type_ = type(value)
 
             edit: QtWidgets.QLineEdit = QtWidgets.QLineEdit(str(value))
-            if type_ is int:
-                validator: QtGui.QIntValidator = QtGui.QIntValidator()
-                edit.setValidator(validator)
-            elif type_ is float:
-                validator: QtGui.QDoubleValidator = QtGui.QDoubleValidator()
+
+            validator: Optional[QtGui.QValidator] = get_validator(type_)
+            if validator:
                 edit.setValidator(validator)
 
             form.addRow(f"{name} {type_}", edit)
@@ -383,6 +660,20 @@ class SettingEditor(QtWidgets.QDialog):
 
         self.setLayout(form)
 
+    def get_form_values(self) -> dict:
+        """Get values shown in the form, adding name and symbols for a new strategy"""
+        if self.class_name:
+            return {"strategy_name": "", "vt_symbols": "", **self.parameters}
+        return self.parameters
+
+    def refresh(self, parameters: dict) -> None:
+        """Reset edits to new parameter values before showing again"""
+        self.parameters = parameters
+
+        values: dict = self.get_form_values()
+        for name, (edit, _) in self.edits.items():
+            edit.setText(str(values[name]))
+
     def get_setting(self) -> dict:
         """Getting strategy configuration"""
         setting: dict = {}
@@ -405,3 +696,38 @@ class SettingEditor(QtWidgets.QDialog):
             setting[name] = value
 
         return setting
+
+
+class StrategyData:
+    """Strategy event data unpacked once for attribute access"""
+
+    __slots__ = (
+        "strategy_name",
+        "class_name",
+        "author",
+        "parameters",
+        "variables",
+        "inited",
+        "trading",
+    )
+
+    def __init__(self, data: dict) -> None:
+        """Constructor"""
+        self.strategy_name: str = data["strategy_name"]
+        self.class_name: str = data["class_name"]
+        self.author: str = data["author"]
+        self.parameters: dict = data["parameters"]
+        self.variables: dict = data["variables"]
+
+        # Button status flags
+        self.inited: bool = bool(self.variables["inited"])
+        self.trading: bool = bool(self.variables["trading"])
+
+
+def get_validator(type_: type) -> Optional[QtGui.QValidator]:
+    """Get the shared validator of a parameter type"""
+    if type_ not in validators:
+        validator_type: Optional[Type[QtGui.QValidator]] = validator_types.get(type_)
+        validators[type_] = validator_type() if validator_type else None
+
+    return validators[type_]
@@ -1,5 +1,7 @@
 from datetime import datetime
-from typing import Callable, Dict, Optional
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
 
 from vnpy.trader.object import BarData, TickData, Interval
 
@@ -222,3 +224,75 @@ class PortfolioBarGenerator:
                 self.interval_count = 0
                 self.on_window_bars(self.window_bars)
                 self.window_bars = {}
+
+
+class PortfolioArrayManager:
+    """
+    Portfolio time series container of bar data.
+
+    OHLCV of all contracts are stored in one (contracts, 5, size) ring buffer.
+    Each contract has its own head and count, so only contracts that received
+    a bar are written and a missing bar never enters the series.
+    """
+
+    OPEN: int = 0
+    HIGH: int = 1
+    LOW: int = 2
+    CLOSE: int = 3
+    VOLUME: int = 4
+
+    def __init__(self, vt_symbols: List[str], size: int = 100) -> None:
+        """Constructor"""
+        self.vt_symbols: List[str] = vt_symbols
+        self.rows: Dict[str, int] = {
+            vt_symbol: row for row, vt_symbol in enumerate(vt_symbols)
+        }
+
+        self.size: int = size
+
+        self.data: np.ndarray = np.zeros((len(vt_symbols), 5, size), dtype=np.float64)
+        self.heads: np.ndarray = np.zeros(len(vt_symbols), dtype=np.int64)
+        self.counts: np.ndarray = np.zeros(len(vt_symbols), dtype=np.int64)
+
+    def update_bars(self, bars: Dict[str, BarData]) -> np.ndarray:
+        """Update new bars, return rows of the contracts updated"""
+        rows: np.ndarray = np.array(
+            [self.rows[vt_symbol] for vt_symbol in bars], dtype=np.int64
+        )
+        if not len(rows):
+            return rows
+
+        matrix: np.ndarray = np.array(
+            [
+                (
+                    bar.open_price,
+                    bar.high_price,
+                    bar.low_price,
+                    bar.close_price,
+                    bar.volume,
+                )
+                for bar in bars.values()
+            ],
+            dtype=np.float64,
+        )
+
+        heads: np.ndarray = self.heads[rows]
+        self.data[rows[:, None], np.arange(5), heads[:, None]] = matrix
+
+        self.heads[rows] = (heads + 1) % self.size
+        self.counts[rows] += 1
+
+        return rows
+
+    def inited(self, vt_symbol: str) -> bool:
+        """Whether the buffer of the contract has been filled"""
+        return self.counts[self.rows[vt_symbol]] >= self.size
+
+    def get_column(
+        self, field: int, ago: int = 0, rows: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Get the field value from ago bars before the latest, all rows by default"""
+        if rows is None:
+            rows = np.arange(len(self.vt_symbols))
+
+        return self.data[rows, field, (self.heads[rows] - 1 - ago) % self.size]